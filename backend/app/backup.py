@@ -0,0 +1,224 @@
+"""Online backups of the SQLite ledger using SQLite's backup API.
+
+CLI:
+    python -m app.backup snapshot          # write a gzip snapshot and apply retention
+    python -m app.backup list
+    python -m app.backup restore <file>    # .db or .db.gz
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from . import models  # noqa: F401  (registers tables on Base.metadata)
+from .db import Base, create_triggers_if_missing, engine, new_sync_epoch
+
+BACKUP_DIR = Path(os.environ.get("HISAB_BACKUP_DIR", "./backups"))
+BACKUP_KEEP = int(os.environ.get("HISAB_BACKUP_KEEP", "7"))
+BACKUP_PAGES_PER_STEP = int(os.environ.get("HISAB_BACKUP_PAGES_PER_STEP", "256"))
+BACKUP_STEP_PAUSE_MS = float(os.environ.get("HISAB_BACKUP_STEP_PAUSE_MS", "5"))
+# Writes from other connections between steps restart a paced backup; after this
+# many restarts the copy is redone in one step, which holds the read lock until done.
+BACKUP_MAX_RESTARTS = 3
+
+CHUNK_SIZE = 64 * 1024
+SNAPSHOT_PREFIX = "house_hisab-"
+SNAPSHOT_SUFFIX = ".db.gz"
+
+
+def database_path() -> Path:
+    name = engine.url.database
+    if not name or name == ":memory:":
+        raise RuntimeError("online backup requires a file-backed SQLite database")
+    return Path(name).resolve()
+
+
+class _RestartBudgetSpent(Exception):
+    pass
+
+
+def backup_to(
+    dest: Path,
+    pages: int = BACKUP_PAGES_PER_STEP,
+    pause_ms: float = BACKUP_STEP_PAUSE_MS,
+    source: Optional[Path] = None,
+) -> None:
+    """Copy the live database into dest, `pages` pages at a time, pausing between steps.
+
+    A busy ledger can keep restarting the paced copy; after BACKUP_MAX_RESTARTS it
+    falls back to a single step so the backup always completes.
+    """
+    pause = pause_ms / 1000.0
+    state = {"remaining": None, "restarts": 0}
+
+    def progress(status: int, remaining: int, total: int) -> None:
+        prev = state["remaining"]
+        if prev is not None and remaining > prev:
+            state["restarts"] += 1
+            if state["restarts"] >= BACKUP_MAX_RESTARTS:
+                # Raising from the callback aborts the stepped copy
+                raise _RestartBudgetSpent
+        state["remaining"] = remaining
+        if remaining and pause:
+            time.sleep(pause)
+
+    src = sqlite3.connect(str(source or database_path()))
+    dst = sqlite3.connect(str(dest))
+    try:
+        try:
+            src.backup(dst, pages=pages, progress=progress)
+        except _RestartBudgetSpent:
+            src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
+def _gzip_file(src: Path, dest: Path) -> None:
+    with src.open("rb") as fin, gzip.open(dest, "wb", compresslevel=6) as fout:
+        shutil.copyfileobj(fin, fout, CHUNK_SIZE)
+
+
+def iter_gzip(path: Path) -> Iterator[bytes]:
+    """Yield gzip-compressed chunks of path without holding the whole file in memory."""
+    comp = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    with path.open("rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            out = comp.compress(chunk)
+            if out:
+                yield out
+    yield comp.flush()
+
+
+def temp_snapshot() -> Path:
+    """Take a consistent uncompressed copy into a temp file; caller removes it."""
+    fd, name = tempfile.mkstemp(prefix=SNAPSHOT_PREFIX, suffix=".db")
+    os.close(fd)
+    path = Path(name)
+    try:
+        backup_to(path)
+    except Exception:
+        path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+def list_snapshots(backup_dir: Path = BACKUP_DIR) -> list[Path]:
+    if not backup_dir.exists():
+        return []
+    return sorted(backup_dir.glob(f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}"), reverse=True)
+
+
+def prune_snapshots(keep: int = BACKUP_KEEP, backup_dir: Path = BACKUP_DIR) -> list[Path]:
+    removed = list_snapshots(backup_dir)[keep:]
+    for p in removed:
+        p.unlink(missing_ok=True)
+    return removed
+
+
+def create_snapshot(backup_dir: Path = BACKUP_DIR, keep: int = BACKUP_KEEP) -> Path:
+    """Write a rotating gzip snapshot into backup_dir and drop the oldest beyond keep."""
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    dest = backup_dir / f"{SNAPSHOT_PREFIX}{stamp}{SNAPSHOT_SUFFIX}"
+    raw = temp_snapshot()
+    try:
+        partial = dest.with_suffix(dest.suffix + ".part")
+        _gzip_file(raw, partial)
+        partial.replace(dest)
+    finally:
+        raw.unlink(missing_ok=True)
+    prune_snapshots(keep, backup_dir)
+    return dest
+
+
+def restore_snapshot(snapshot: Path) -> None:
+    """Replace the live database contents with snapshot (.db or .db.gz).
+
+    Goes through the backup API into the live file so open connections see a
+    consistent database rather than a file swapped underneath them.
+    """
+    fd, name = tempfile.mkstemp(prefix=SNAPSHOT_PREFIX, suffix=".db")
+    os.close(fd)
+    staged = Path(name)
+    try:
+        if snapshot.name.endswith(".gz"):
+            with gzip.open(snapshot, "rb") as fin, staged.open("wb") as fout:
+                shutil.copyfileobj(fin, fout, CHUNK_SIZE)
+        else:
+            shutil.copyfile(snapshot, staged)
+        with sqlite3.connect(str(staged)) as check:
+            result = check.execute("PRAGMA integrity_check").fetchone()[0]
+        if result != "ok":
+            raise RuntimeError(f"snapshot failed integrity check: {result}")
+        version = _ledger_version()
+        src = sqlite3.connect(str(staged))
+        dst = sqlite3.connect(str(database_path()))
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
+    finally:
+        staged.unlink(missing_ok=True)
+    _after_restore(version)
+
+
+def _ledger_version() -> int:
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT version FROM ledger_state WHERE id = 1")).scalar() or 0
+    except OperationalError:
+        return 0
+
+
+def _after_restore(prev_version: int) -> None:
+    """Bring an older snapshot's schema up to date, move the ledger version past its
+    pre-restore value so facet counts cached by running workers are dropped, and
+    start a new sync epoch: the restored seqs repeat ones clients already hold."""
+    Base.metadata.create_all(bind=engine)
+    create_triggers_if_missing()
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE ledger_state SET version = max(version, :prev) + 1 WHERE id = 1"),
+            {"prev": prev_version},
+        )
+        conn.execute(text("UPDATE sync_meta SET epoch = :epoch WHERE id = 1"), {"epoch": new_sync_epoch()})
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.backup", description="Online ledger backups")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    snap = sub.add_parser("snapshot", help="write a gzip snapshot and apply retention")
+    snap.add_argument("--dir", type=Path, default=BACKUP_DIR)
+    snap.add_argument("--keep", type=int, default=BACKUP_KEEP)
+    ls = sub.add_parser("list", help="list snapshots, newest first")
+    ls.add_argument("--dir", type=Path, default=BACKUP_DIR)
+    rest = sub.add_parser("restore", help="restore the live database from a snapshot")
+    rest.add_argument("snapshot", type=Path)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "snapshot":
+        print(create_snapshot(args.dir, args.keep))
+    elif args.cmd == "list":
+        for p in list_snapshots(args.dir):
+            print(p)
+    elif args.cmd == "restore":
+        restore_snapshot(args.snapshot)
+        print(f"restored {database_path()} from {args.snapshot}")
+
+
+if __name__ == "__main__":
+    main()
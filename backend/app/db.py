@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import os
+import uuid
 from typing import Generator
 
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./house_hisab.db"
+SQLALCHEMY_DATABASE_URL = os.environ.get("HISAB_DATABASE_URL", "sqlite:///./house_hisab.db")
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
@@ -25,8 +27,12 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def new_sync_epoch() -> str:
+    return uuid.uuid4().hex
+
+
 def create_triggers_if_missing() -> None:
-    """Create SQLite triggers to keep fund balances in sync with transactions."""
+    """Create SQLite triggers to keep fund balances in sync with transactions, bump the ledger version and stamp the sync change log."""
     with engine.begin() as conn:
         # INSERT
         conn.execute(text(
@@ -102,3 +108,98 @@ def create_triggers_if_missing() -> None:
             END;
             """
         ))
+
+        # Ledger version for cached facet counts: bumped by every writer (other
+        # workers, seed loader, raw SQL), not just this process's ORM sessions.
+        conn.execute(text("INSERT OR IGNORE INTO ledger_state (id, version) VALUES (1, 0)"))
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(text(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS trg_ledger_version_{event.lower()}
+                AFTER {event} ON transactions
+                BEGIN
+                    UPDATE ledger_state SET version = version + 1 WHERE id = 1;
+                END;
+                """
+            ))
+
+        # Change sequence for delta sync: every write re-stamps the row's entry in
+        # sync_changes with a fresh AUTOINCREMENT seq; deletes leave a tombstone.
+        conn.execute(text("INSERT OR IGNORE INTO sync_meta (id, epoch) VALUES (1, :epoch)"), {"epoch": new_sync_epoch()})
+        for table, entity in (("transactions", "transaction"), ("people", "person"), ("categories", "category")):
+            conn.execute(text(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS trg_sync_{table}_insert
+                AFTER INSERT ON {table}
+                BEGIN
+                    INSERT OR REPLACE INTO sync_changes (entity, entity_id, deleted) VALUES ('{entity}', NEW.id, 0);
+                END;
+                """
+            ))
+            conn.execute(text(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS trg_sync_{table}_update
+                AFTER UPDATE ON {table}
+                BEGIN
+                    INSERT OR REPLACE INTO sync_changes (entity, entity_id, deleted)
+                    SELECT '{entity}', OLD.id, 1 WHERE OLD.id <> NEW.id;
+                    INSERT OR REPLACE INTO sync_changes (entity, entity_id, deleted) VALUES ('{entity}', NEW.id, 0);
+                END;
+                """
+            ))
+            conn.execute(text(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS trg_sync_{table}_delete
+                AFTER DELETE ON {table}
+                BEGIN
+                    INSERT OR REPLACE INTO sync_changes (entity, entity_id, deleted) VALUES ('{entity}', OLD.id, 1);
+                END;
+                """
+            ))
+            # Ledgers that predate the sync log: give existing rows a seq once
+            if conn.execute(text("SELECT 1 FROM sync_changes WHERE entity = :e LIMIT 1"), {"e": entity}).first() is None:
+                conn.execute(text(
+                    f"INSERT OR IGNORE INTO sync_changes (entity, entity_id, deleted) SELECT '{entity}', id, 0 FROM {table}"
+                ))
+
+
+def create_indexes_if_missing() -> None:
+    """Create indexes used by listings and facet counts (existing DBs predate them)."""
+    with engine.begin() as conn:
+        # Listing order: date DESC, id DESC
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_txn_date_id ON transactions (date, id)"
+        ))
+        # Covers the facet GROUP BY plus the equality/range filters of list_txns
+        conn.execute(text(
+            """
+            CREATE INDEX IF NOT EXISTS ix_txn_facets ON transactions
+                (txn_type, posting, fund_from, fund_to, category_id, person_id, date)
+            """
+        ))
+        # Journals created before undo_of was unique carry a plain index
+        undo_idx = conn.execute(text(
+            "SELECT \"unique\" FROM pragma_index_list('journal') WHERE name = 'ix_journal_undo_of'"
+        )).first()
+        if undo_idx is not None and not undo_idx[0]:
+            conn.execute(text("DROP INDEX ix_journal_undo_of"))
+            conn.execute(text("CREATE UNIQUE INDEX ix_journal_undo_of ON journal (undo_of)"))
+        # Without stats the planner takes ix_txn_facets for txn_type= listings and
+        # sorts every match instead of walking ix_txn_date_id.
+        has_stats = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+        )).first()
+        conn.execute(text("PRAGMA optimize" if has_stats else "ANALYZE"))
+
+
+def enable_wal() -> None:
+    """Switch the ledger to WAL so long reads (exports, reports) don't block commits.
+
+    In the default rollback journal a reader's SHARED lock stalls every writer's
+    COMMIT until the read finishes. journal_mode is stored in the database file,
+    so HISAB_SQLITE_WAL=0 switches an existing WAL ledger back to DELETE rather
+    than just skipping the pragma.
+    """
+    mode = "WAL" if os.environ.get("HISAB_SQLITE_WAL", "1") == "1" else "DELETE"
+    with engine.connect() as conn:
+        conn.exec_driver_sql(f"PRAGMA journal_mode={mode}")
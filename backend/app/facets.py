@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from .models import FUND_VALUES, LedgerState, Transaction
+
+FACET_CACHE_SIZE = 256
+
+
+def ledger_version(db: Session) -> int:
+    """Trigger-maintained counter of writes to transactions (one PK lookup)."""
+    return db.execute(select(LedgerState.version).where(LedgerState.id == 1)).scalar_one_or_none() or 0
+
+
+class FacetCache:
+    """Bounded LRU of facet counts keyed by normalized filter, tagged with the ledger version."""
+
+    def __init__(self, maxsize: int = FACET_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[int, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: int) -> Optional[dict]:
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            if hit[0] != version:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return hit[1]
+
+    def put(self, key: Hashable, version: int, value: dict) -> None:
+        with self._lock:
+            self._data[key] = (version, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+facet_cache = FacetCache()
+
+
+def compute_counts(db: Session, conds: list) -> dict:
+    """Total and per-facet counts from a single GROUP BY over the facet columns."""
+    stmt = select(
+        Transaction.txn_type,
+        Transaction.posting,
+        Transaction.fund_from,
+        Transaction.fund_to,
+        Transaction.category_id,
+        func.count(),
+    ).group_by(
+        Transaction.txn_type,
+        Transaction.posting,
+        Transaction.fund_from,
+        Transaction.fund_to,
+        Transaction.category_id,
+    )
+    if conds:
+        stmt = stmt.where(*conds)
+
+    total = 0
+    by_type: dict[str, int] = {}
+    by_fund: dict[str, int] = {f: 0 for f in FUND_VALUES}
+    by_posting: dict[str, int] = {"true": 0, "false": 0}
+    by_category: dict[str, int] = {}
+    for txn_type, posting, fund_from, fund_to, category_id, n in db.execute(stmt):
+        total += n
+        by_type[txn_type] = by_type.get(txn_type, 0) + n
+        by_posting["true" if posting else "false"] += n
+        for fund in {fund_from, fund_to} - {None}:
+            by_fund[fund] = by_fund.get(fund, 0) + n
+        if category_id is not None:
+            by_category[category_id] = by_category.get(category_id, 0) + n
+    return {
+        "total": total,
+        "facets": {
+            "txn_type": by_type,
+            "fund": by_fund,
+            "posting": by_posting,
+            "category_id": by_category,
+        },
+    }
+
+
+def cached_counts(db: Session, key: Hashable, conds: list) -> dict:
+    # Read the version before querying: a commit racing with the query can then
+    # only make the cached entry look stale, never make stale counts look fresh.
+    version = ledger_version(db)
+    hit = facet_cache.get(key, version)
+    if hit is not None:
+        return hit
+    counts = compute_counts(db, conds)
+    facet_cache.put(key, version, counts)
+    return counts
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Any, Collection, Iterable, Literal, Optional, Sequence
+
+from fastapi import HTTPException
+
+ListFormat = Literal["rows", "columnar"]
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> list[str]:
+    """Turn ?fields=a,b,c into a validated, de-duplicated column list (all columns if empty)."""
+    if not fields:
+        return list(allowed)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(requested))
+
+
+def encode_rows(
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    format: ListFormat = "rows",
+    date_columns: Collection[str] = ("date",),
+) -> Any:
+    """Encode plain result tuples as a list of objects or as {"columns", "data"}."""
+    date_idx = [i for i, c in enumerate(columns) if c in date_columns]
+    data = []
+    for row in rows:
+        row = list(row)
+        for i in date_idx:
+            if row[i] is not None:
+                row[i] = row[i].isoformat()
+        data.append(row)
+    if format == "columnar":
+        return {"columns": list(columns), "data": data}
+    return [dict(zip(columns, r)) for r in data]
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import date, datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from .models import FUND_VALUES, FundBalance, JournalEntry, JournalSnapshot, Transaction
+
+JOURNAL_SNAPSHOT_EVERY = int(os.environ.get("HISAB_JOURNAL_SNAPSHOT_EVERY", "1000"))
+
+TXN_COLUMNS = tuple(c.name for c in Transaction.__table__.columns)
+_JOURNAL_INSERT = JournalEntry.__table__.insert()
+
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"), default=lambda v: v.isoformat())
+
+
+def row_of(t: Transaction) -> dict:
+    return {c: getattr(t, c) for c in TXN_COLUMNS}
+
+
+def _txn_from_row(row: dict) -> Transaction:
+    values = dict(row)
+    values["date"] = date.fromisoformat(values["date"])
+    return Transaction(**values)
+
+
+def _jsonable(row: dict) -> dict:
+    return json.loads(_dumps(row))
+
+
+def balance_effect(row: dict, sign: int = 1) -> tuple[dict[str, int], dict[str, int]]:
+    """Fund and per-type total changes of one transaction row (same rules as the triggers)."""
+    funds: dict[str, int] = {}
+    amount = sign * row["amount_paise"]
+    t = row["txn_type"]
+    if row["posting"]:
+        if t in ("CONTRIBUTION", "INCOME") and row["fund_to"]:
+            funds[row["fund_to"]] = funds.get(row["fund_to"], 0) + amount
+        elif t == "EXPENSE" and row["fund_from"]:
+            funds[row["fund_from"]] = funds.get(row["fund_from"], 0) - amount
+        elif t == "TRANSFER":
+            if row["fund_from"]:
+                funds[row["fund_from"]] = funds.get(row["fund_from"], 0) - amount
+            if row["fund_to"]:
+                funds[row["fund_to"]] = funds.get(row["fund_to"], 0) + amount
+    totals = {f"{t}:{int(bool(row['posting']))}": amount}
+    return funds, totals
+
+
+def _add_into(into: dict[str, int], other: dict[str, int]) -> None:
+    for k, v in other.items():
+        into[k] = into.get(k, 0) + v
+
+
+def _effect(before: Optional[dict], after: Optional[dict]) -> str:
+    funds: dict[str, int] = {}
+    totals: dict[str, int] = {}
+    for row, sign in ((before, -1), (after, 1)):
+        if row is not None:
+            f, t = balance_effect(row, sign)
+            _add_into(funds, f)
+            _add_into(totals, t)
+    return _dumps({
+        "funds": {k: v for k, v in funds.items() if v},
+        "totals": {k: v for k, v in totals.items() if v},
+    })
+
+
+def _append(db: Session, entity: str, entity_id: str, op: str, delta: dict,
+            effect: Optional[str] = None, undo_of: Optional[int] = None) -> int:
+    # Core insert: one statement, no unit-of-work bookkeeping on the hot write path
+    result = db.execute(_JOURNAL_INSERT, {
+        "created_at": datetime.utcnow(), "entity": entity, "entity_id": entity_id, "op": op,
+        "delta": _dumps(delta), "effect": effect, "undo_of": undo_of,
+    })
+    entry_id = result.inserted_primary_key[0]
+    if JOURNAL_SNAPSHOT_EVERY and entry_id % JOURNAL_SNAPSHOT_EVERY == 0:
+        compact(db)
+    return entry_id
+
+
+def record_insert(db: Session, t: Transaction, undo_of: Optional[int] = None) -> int:
+    row = _jsonable(row_of(t))
+    return _append(db, "transaction", t.id, "insert", row, _effect(None, row), undo_of)
+
+
+def record_delete(db: Session, t: Transaction, undo_of: Optional[int] = None) -> int:
+    row = _jsonable(row_of(t))
+    return _append(db, "transaction", t.id, "delete", row, _effect(row, None), undo_of)
+
+
+def record_update(db: Session, before: dict, t: Transaction, undo_of: Optional[int] = None) -> Optional[int]:
+    old = _jsonable(before)
+    new = _jsonable(row_of(t))
+    changes = {c: [old[c], new[c]] for c in TXN_COLUMNS if old[c] != new[c]}
+    if not changes:
+        return None
+    return _append(db, "transaction", t.id, "update", changes, _effect(old, new), undo_of)
+
+
+def record_fund_set(db: Session, fund: str, old: int, new: int, undo_of: Optional[int] = None) -> Optional[int]:
+    if old == new:
+        return None
+    return _append(db, "fund", fund, "set", {"balance_paise": [old, new]}, None, undo_of)
+
+
+def undo(db: Session, journal_id: int) -> int:
+    """Apply the inverse of a journal entry; returns the id of the new (undo) entry."""
+    entry = db.get(JournalEntry, journal_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="journal entry not found")
+    if db.execute(select(JournalEntry.id).where(JournalEntry.undo_of == journal_id)).first():
+        raise HTTPException(status_code=409, detail="journal entry already undone")
+    delta = json.loads(entry.delta)
+    conflict = HTTPException(status_code=409, detail="entity changed since this entry; undo the later entries first")
+
+    if entry.entity == "fund":
+        old, new = delta["balance_paise"]
+        fb = db.get(FundBalance, entry.entity_id)
+        if not fb or fb.balance_paise != new:
+            raise conflict
+        fb.balance_paise = old
+        db.flush()
+        return record_fund_set(db, entry.entity_id, new, old, undo_of=journal_id)
+
+    t = db.get(Transaction, entry.entity_id)
+    if entry.op == "insert":
+        if not t or _jsonable(row_of(t)) != delta:
+            raise conflict
+        db.delete(t)
+        db.flush()
+        return record_delete(db, t, undo_of=journal_id)
+    if entry.op == "delete":
+        if t:
+            raise conflict
+        t = _txn_from_row(delta)
+        db.add(t)
+        db.flush()
+        return record_insert(db, t, undo_of=journal_id)
+    # update
+    if not t:
+        raise conflict
+    current = _jsonable(row_of(t))
+    if any(current[c] != new for c, (_old, new) in delta.items()):
+        raise conflict
+    before = row_of(t)
+    for c, (old, _new) in delta.items():
+        setattr(t, c, date.fromisoformat(old) if c == "date" else old)
+    db.flush()
+    return record_update(db, before, t, undo_of=journal_id)
+
+
+def current_totals(db: Session) -> dict[str, int]:
+    rows = db.execute(
+        select(Transaction.txn_type, Transaction.posting, func.sum(Transaction.amount_paise))
+        .group_by(Transaction.txn_type, Transaction.posting)
+    ).all()
+    return {f"{t}:{int(bool(p))}": int(total) for t, p, total in rows if total}
+
+
+def current_funds(db: Session) -> dict[str, int]:
+    return {f.fund: f.balance_paise for f in db.execute(select(FundBalance)).scalars()}
+
+
+def ensure_genesis_snapshot(db: Session) -> None:
+    """Anchor replay at the ledger as it stood when journaling started."""
+    if db.execute(select(JournalSnapshot.id).limit(1)).first():
+        return
+    last = db.execute(select(func.coalesce(func.max(JournalEntry.id), 0))).scalar_one()
+    db.add(JournalSnapshot(journal_id=last, state=_dumps({"funds": current_funds(db), "totals": current_totals(db)})))
+    db.commit()
+
+
+def replay(db: Session, from_start: bool = False) -> dict:
+    """Rebuild fund balances and per-type totals from a snapshot plus later journal entries."""
+    order = JournalSnapshot.journal_id.asc() if from_start else JournalSnapshot.journal_id.desc()
+    base = db.execute(select(JournalSnapshot).order_by(order, JournalSnapshot.id.desc()).limit(1)).scalar_one_or_none()
+    state = json.loads(base.state) if base else {"funds": {}, "totals": {}}
+    funds: dict[str, int] = {f: 0 for f in FUND_VALUES}
+    funds.update(state["funds"])
+    totals: dict[str, int] = dict(state["totals"])
+    since = base.journal_id if base else 0
+
+    stmt = (
+        select(JournalEntry.id, JournalEntry.entity, JournalEntry.entity_id, JournalEntry.delta, JournalEntry.effect)
+        .where(JournalEntry.id > since)
+        .order_by(JournalEntry.id)
+        .execution_options(yield_per=2000)
+    )
+    last = since
+    replayed = 0
+    for jid, entity, entity_id, delta, effect in db.execute(stmt):
+        if entity == "fund":
+            # Balance overrides are absolute
+            funds[entity_id] = json.loads(delta)["balance_paise"][1]
+        else:
+            fx = json.loads(effect)
+            _add_into(funds, fx["funds"])
+            _add_into(totals, fx["totals"])
+        last = jid
+        replayed += 1
+    return {
+        "journal_id": last,
+        "base_journal_id": since,
+        "replayed": replayed,
+        "funds": funds,
+        "totals": {k: v for k, v in totals.items() if v},
+    }
+
+
+def compact(db: Session) -> JournalSnapshot:
+    """Fold the journal up to its newest entry into a snapshot (entries are kept for audit/undo)."""
+    state = replay(db)
+    snap = JournalSnapshot(journal_id=state["journal_id"],
+                           state=_dumps({"funds": state["funds"], "totals": state["totals"]}))
+    db.add(snap)
+    db.flush()
+    return snap
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import socket
+from typing import Optional
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from pathlib import Path
 
-from .db import Base, engine, create_triggers_if_missing, SessionLocal
+from .db import Base, engine, create_triggers_if_missing, create_indexes_if_missing, enable_wal, SessionLocal
 from .models import FundBalance
-from .routers import funds, transactions, people, categories, reports
+from .write_queue import WRITE_QUEUE_ENABLED, write_queue
+from .journal import ensure_genesis_snapshot
+from .routers import funds, transactions, people, categories, reports, admin, journal, sync
 
 
 def _get_local_ip() -> str:
@@ -24,8 +29,112 @@ def _get_local_ip() -> str:
     return ip
 
 
+ADMISSION_ENABLED = os.environ.get("HISAB_ADMISSION", "1") == "1"
+ADMISSION_QUEUE_TIMEOUT_S = float(os.environ.get("HISAB_ADMISSION_QUEUE_TIMEOUT_S", "10"))
+
+
+class Lane:
+    """Bounded concurrency plus a bounded wait queue for one priority class."""
+
+    def __init__(self, name: str, concurrency: int, max_queue: int, retry_after: int) -> None:
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.waiting = 0
+        self._sem: Optional[asyncio.Semaphore] = None
+
+    async def acquire(self, timeout: float) -> bool:
+        if self._sem is None:
+            # Created lazily so it binds to the server's running loop
+            self._sem = asyncio.Semaphore(self.concurrency)
+        if not self._sem.locked():
+            # Free slot: acquire() returns without suspending, so a burst can't all
+            # slip past the queue check before any of them holds the semaphore
+            await self._sem.acquire()
+            return True
+        if self.waiting >= self.max_queue:
+            return False
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._sem.acquire(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.waiting -= 1
+
+    def release(self) -> None:
+        self._sem.release()
+
+
+# Interactive routes (add page, funds, people/categories) get no lane: capping the
+# other classes is what keeps threadpool workers and the GIL free for them.
+LANES = {
+    "heavy": Lane(
+        "heavy",
+        int(os.environ.get("HISAB_HEAVY_CONCURRENCY", "2")),
+        int(os.environ.get("HISAB_HEAVY_QUEUE", "4")),
+        retry_after=5,
+    ),
+    "default": Lane(
+        "default",
+        int(os.environ.get("HISAB_DEFAULT_CONCURRENCY", "8")),
+        int(os.environ.get("HISAB_DEFAULT_QUEUE", "32")),
+        retry_after=1,
+    ),
+}
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """Priority class of a request: "interactive", "heavy", "default", or None (not API)."""
+    if not path.startswith("/api/"):
+        return None
+    if path.startswith(("/api/v1/reports/", "/api/v1/admin/")):
+        return "heavy"
+    if method == "POST" and path.startswith("/api/v1/journal/"):
+        return "heavy"
+    if path in ("/api/v1/funds", "/api/v1/health") or path.startswith(("/api/v1/people", "/api/v1/categories")):
+        return "interactive"
+    if path.startswith("/api/v1/transactions") and method != "GET":
+        return "interactive"
+    return "default"
+
+
+class AdmissionControl:
+    """ASGI middleware: queue heavy/default requests per lane, 503 + Retry-After when full."""
+
+    def __init__(self, app, lanes: dict[str, Lane] = LANES, timeout: float = ADMISSION_QUEUE_TIMEOUT_S) -> None:
+        self.app = app
+        self.lanes = lanes
+        self.timeout = timeout
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        lane = self.lanes.get(route_class(scope["method"], scope["path"]))
+        if lane is None:
+            return await self.app(scope, receive, send)
+        if not await lane.acquire(self.timeout):
+            await JSONResponse(
+                {"detail": f"server busy ({lane.name} requests), retry later"},
+                status_code=503,
+                headers={"Retry-After": str(lane.retry_after)},
+            )(scope, receive, send)
+            return
+        try:
+            # Held until the response body is fully sent (covers streamed exports/backups)
+            await self.app(scope, receive, send)
+        finally:
+            lane.release()
+
+
 app = FastAPI(title="Three-Fund Ledger", version="1.0.0")
 
+if ADMISSION_ENABLED:
+    # Added before CORS so it sits inside it and 503s still carry CORS headers
+    app.add_middleware(AdmissionControl)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -37,6 +146,7 @@ app.add_middleware(
 
 @app.on_event("startup")
 def on_startup():
+    enable_wal()
     Base.metadata.create_all(bind=engine)
     # Ensure all fund rows exist
     with SessionLocal() as db:
@@ -44,7 +154,11 @@ def on_startup():
             if not db.get(FundBalance, fund):
                 db.add(FundBalance(fund=fund, balance_paise=0))
         db.commit()
+        ensure_genesis_snapshot(db)
     create_triggers_if_missing()
+    create_indexes_if_missing()
+    if WRITE_QUEUE_ENABLED:
+        write_queue.start()
 
     # Helpful LAN URL print when running with --host 0.0.0.0
     ip = _get_local_ip()
@@ -52,12 +166,20 @@ def on_startup():
     print(f"Open on your LAN: http://{ip}:{port}")
 
 
+@app.on_event("shutdown")
+def on_shutdown():
+    write_queue.stop()
+
+
 # API routers
 app.include_router(funds.router)
 app.include_router(transactions.router)
 app.include_router(people.router)
 app.include_router(categories.router)
 app.include_router(reports.router)
+app.include_router(admin.router)
+app.include_router(journal.router)
+app.include_router(sync.router)
 
 
 # Serve exported frontend
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime
 from typing import Optional
 
 from sqlalchemy import (
@@ -8,9 +8,12 @@ from sqlalchemy import (
     Boolean,
     CheckConstraint,
     Date,
+    DateTime,
     ForeignKey,
+    Integer,
     String,
     Text,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -81,3 +84,77 @@ class Transaction(Base):
 
     person: Mapped[Optional[Person]] = relationship(back_populates="transactions")
     category: Mapped[Optional[Category]] = relationship(back_populates="transactions")
+
+
+class JournalEntry(Base):
+    """Append-only record of one ledger mutation.
+
+    delta: full row for insert/delete, {field: [old, new]} for update/set.
+    effect: net change to fund balances and per-type totals (transactions only).
+    """
+
+    __tablename__ = "journal"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    entity: Mapped[str] = mapped_column(String, nullable=False)
+    entity_id: Mapped[str] = mapped_column(String, nullable=False)
+    op: Mapped[str] = mapped_column(String, nullable=False)
+    delta: Mapped[str] = mapped_column(Text, nullable=False)
+    effect: Mapped[Optional[str]] = mapped_column(Text)
+    # Unique: an entry can be undone at most once, even by racing requests
+    undo_of: Mapped[Optional[int]] = mapped_column(Integer, index=True, unique=True)
+
+
+class JournalSnapshot(Base):
+    """Fund balances and per-type totals as of journal entry journal_id."""
+
+    __tablename__ = "journal_snapshots"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    journal_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    state: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+class SyncChange(Base):
+    """Latest change per synced row; seq is bumped by triggers, deleted marks a tombstone."""
+
+    __tablename__ = "sync_changes"
+    __table_args__ = (
+        UniqueConstraint("entity", "entity_id", name="uq_sync_entity"),
+        {"sqlite_autoincrement": True},
+    )
+
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    entity: Mapped[str] = mapped_column(String, nullable=False)
+    entity_id: Mapped[str] = mapped_column(String, nullable=False)
+    deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+
+
+class SyncMeta(Base):
+    """Single row (id=1); epoch is regenerated whenever the ledger is restored, which
+    invalidates every client's sync cursor."""
+
+    __tablename__ = "sync_meta"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    epoch: Mapped[str] = mapped_column(String, nullable=False)
+
+
+class SyncAppliedOp(Base):
+    """Client op ids already applied by POST /sync, with their stored outcome."""
+
+    __tablename__ = "sync_applied_ops"
+
+    op_id: Mapped[str] = mapped_column(String, primary_key=True)
+    result: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+class LedgerState(Base):
+    """Single row (id=1); version is bumped by triggers on every write to transactions."""
+
+    __tablename__ = "ledger_state"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from .. import backup
+
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
+
+
+@router.get("/backup")
+def download_backup():
+    # Paced online copy first, so the stream is a consistent point-in-time snapshot
+    path = backup.temp_snapshot()
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    return StreamingResponse(
+        backup.iter_gzip(path),
+        media_type="application/gzip",
+        headers={"Content-Disposition": f'attachment; filename="house_hisab-{stamp}.db.gz"'},
+        background=BackgroundTask(path.unlink, missing_ok=True),
+    )
+
+
+@router.get("/snapshots")
+def list_snapshots():
+    return [{"name": p.name, "size": p.stat().st_size} for p in backup.list_snapshots()]
+
+
+@router.post("/snapshots")
+def create_snapshot():
+    p = backup.create_snapshot()
+    return {"name": p.name, "size": p.stat().st_size}
@@ -7,6 +7,8 @@ from sqlalchemy.orm import Session
 from ..db import get_db
 from ..models import Category
 from ..schemas import CategoryCreate, CategoryOut, CategoryUpdate
+from ..write_queue import apply_write
+from .transactions import clear_txn_refs
 
 router = APIRouter(prefix="/api/v1/categories", tags=["categories"])
 
@@ -24,31 +26,40 @@ def list_categories(db: Session = Depends(get_db)):
 @router.post("", response_model=CategoryOut)
 def create_category(payload: CategoryCreate, db: Session = Depends(get_db)):
     cid = payload.id or _generate_id(payload.name)
-    if db.get(Category, cid):
-        raise HTTPException(status_code=409, detail="category with id already exists")
-    c = Category(id=cid, name=payload.name)
-    db.add(c)
-    db.commit()
-    db.refresh(c)
-    return c
+
+    def op(s: Session) -> CategoryOut:
+        if s.get(Category, cid):
+            raise HTTPException(status_code=409, detail="category with id already exists")
+        c = Category(id=cid, name=payload.name)
+        s.add(c)
+        s.flush()
+        return CategoryOut.model_validate(c)
+
+    return apply_write(db, op)
 
 
 @router.put("/{category_id}", response_model=CategoryOut)
 def update_category(category_id: str, payload: CategoryUpdate, db: Session = Depends(get_db)):
-    c = db.get(Category, category_id)
-    if not c:
-        raise HTTPException(status_code=404, detail="category not found")
-    c.name = payload.name
-    db.commit()
-    db.refresh(c)
-    return c
+    def op(s: Session) -> CategoryOut:
+        c = s.get(Category, category_id)
+        if not c:
+            raise HTTPException(status_code=404, detail="category not found")
+        c.name = payload.name
+        s.flush()
+        return CategoryOut.model_validate(c)
+
+    return apply_write(db, op)
 
 
 @router.delete("/{category_id}")
 def delete_category(category_id: str, db: Session = Depends(get_db)):
-    c = db.get(Category, category_id)
-    if not c:
-        raise HTTPException(status_code=404, detail="category not found")
-    db.delete(c)
-    db.commit()
-    return {"ok": True}
+    def op(s: Session) -> dict:
+        c = s.get(Category, category_id)
+        if not c:
+            raise HTTPException(status_code=404, detail="category not found")
+        clear_txn_refs(s, "category_id", c.id)
+        s.delete(c)
+        s.flush()
+        return {"ok": True}
+
+    return apply_write(db, op)
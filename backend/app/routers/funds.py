@@ -5,8 +5,10 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ..db import get_db
+from ..journal import record_fund_set
 from ..models import FundBalance
 from ..schemas import FundBalancesOut, FundBalancesPatch
+from ..write_queue import apply_write
 
 router = APIRouter(prefix="/api/v1/funds", tags=["funds"])
 
@@ -24,13 +26,18 @@ def get_funds(db: Session = Depends(get_db)):
 
 @router.patch("", response_model=FundBalancesOut)
 def patch_funds(payload: FundBalancesPatch, db: Session = Depends(get_db)):
-    for fund_key, field in (("CASH", "cash"), ("ONLINE_A", "online_a"), ("ONLINE_Y", "online_y")):
-        value = getattr(payload, field)
-        if value is not None:
-            fb = db.get(FundBalance, fund_key)
-            if not fb:
-                fb = FundBalance(fund=fund_key, balance_paise=0)
-                db.add(fb)
-            fb.balance_paise = value
-    db.commit()
+    def op(s: Session) -> None:
+        for fund_key, field in (("CASH", "cash"), ("ONLINE_A", "online_a"), ("ONLINE_Y", "online_y")):
+            value = getattr(payload, field)
+            if value is not None:
+                fb = s.get(FundBalance, fund_key)
+                if not fb:
+                    fb = FundBalance(fund=fund_key, balance_paise=0)
+                    s.add(fb)
+                old = fb.balance_paise
+                fb.balance_paise = value
+                s.flush()
+                record_fund_set(s, fund_key, old, value)
+
+    apply_write(db, op)
     return get_funds(db)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import journal
+from ..db import get_db
+from ..models import FundBalance, JournalEntry
+from ..schemas import JournalEntryOut, JournalSnapshotOut, RebuildOut
+from ..write_queue import apply_write
+
+router = APIRouter(prefix="/api/v1", tags=["journal"])
+
+
+@router.get("/journal", response_model=list[JournalEntryOut])
+def list_journal(after_id: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    return db.execute(
+        select(JournalEntry).where(JournalEntry.id > after_id).order_by(JournalEntry.id).limit(min(limit, 1000))
+    ).scalars().all()
+
+
+@router.post("/undo/{journal_id}", response_model=JournalEntryOut)
+def undo(journal_id: int, db: Session = Depends(get_db)):
+    def op(s: Session) -> JournalEntryOut:
+        entry_id = journal.undo(s, journal_id)
+        return JournalEntryOut.model_validate(s.get(JournalEntry, entry_id))
+
+    try:
+        return apply_write(db, op)
+    except IntegrityError:
+        # uq on undo_of: a concurrent undo of the same entry got there first
+        raise HTTPException(status_code=409, detail="journal entry already undone")
+
+
+@router.post("/journal/compact", response_model=JournalSnapshotOut)
+def compact(db: Session = Depends(get_db)):
+    return apply_write(db, lambda s: JournalSnapshotOut.model_validate(journal.compact(s)))
+
+
+@router.post("/journal/rebuild", response_model=RebuildOut)
+def rebuild(from_start: bool = False, apply: bool = False, db: Session = Depends(get_db)):
+    """Replay the journal; with apply=true, overwrite fund_balances with the replayed values."""
+    def op(s: Session) -> dict:
+        state = journal.replay(s, from_start=from_start)
+        stored = journal.current_funds(s)
+        if apply:
+            for fund, value in state["funds"].items():
+                fb = s.get(FundBalance, fund)
+                if not fb:
+                    fb = FundBalance(fund=fund, balance_paise=0)
+                    s.add(fb)
+                old = fb.balance_paise
+                fb.balance_paise = value
+                s.flush()
+                journal.record_fund_set(s, fund, old, value)
+        return {
+            **state,
+            "stored_funds": stored,
+            "discrepancy": {f: stored.get(f, 0) - v for f, v in state["funds"].items() if stored.get(f, 0) != v},
+        }
+
+    if apply:
+        return apply_write(db, op)
+    return op(db)
@@ -7,6 +7,8 @@ from sqlalchemy.orm import Session
 from ..db import get_db
 from ..models import Person
 from ..schemas import PersonCreate, PersonOut, PersonUpdate
+from ..write_queue import apply_write
+from .transactions import clear_txn_refs
 
 router = APIRouter(prefix="/api/v1/people", tags=["people"])
 
@@ -24,31 +26,40 @@ def list_people(db: Session = Depends(get_db)):
 @router.post("", response_model=PersonOut)
 def create_person(payload: PersonCreate, db: Session = Depends(get_db)):
     pid = payload.id or _generate_id(payload.name)
-    if db.get(Person, pid):
-        raise HTTPException(status_code=409, detail="person with id already exists")
-    p = Person(id=pid, name=payload.name)
-    db.add(p)
-    db.commit()
-    db.refresh(p)
-    return p
+
+    def op(s: Session) -> PersonOut:
+        if s.get(Person, pid):
+            raise HTTPException(status_code=409, detail="person with id already exists")
+        p = Person(id=pid, name=payload.name)
+        s.add(p)
+        s.flush()
+        return PersonOut.model_validate(p)
+
+    return apply_write(db, op)
 
 
 @router.put("/{person_id}", response_model=PersonOut)
 def update_person(person_id: str, payload: PersonUpdate, db: Session = Depends(get_db)):
-    p = db.get(Person, person_id)
-    if not p:
-        raise HTTPException(status_code=404, detail="person not found")
-    p.name = payload.name
-    db.commit()
-    db.refresh(p)
-    return p
+    def op(s: Session) -> PersonOut:
+        p = s.get(Person, person_id)
+        if not p:
+            raise HTTPException(status_code=404, detail="person not found")
+        p.name = payload.name
+        s.flush()
+        return PersonOut.model_validate(p)
+
+    return apply_write(db, op)
 
 
 @router.delete("/{person_id}")
 def delete_person(person_id: str, db: Session = Depends(get_db)):
-    p = db.get(Person, person_id)
-    if not p:
-        raise HTTPException(status_code=404, detail="person not found")
-    db.delete(p)
-    db.commit()
-    return {"ok": True}
+    def op(s: Session) -> dict:
+        p = s.get(Person, person_id)
+        if not p:
+            raise HTTPException(status_code=404, detail="person not found")
+        clear_txn_refs(s, "person_id", p.id)
+        s.delete(p)
+        s.flush()
+        return {"ok": True}
+
+    return apply_write(db, op)
@@ -5,15 +5,24 @@ import io
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from ..db import get_db
+from ..fieldsets import ListFormat, encode_rows, parse_fields
 from ..models import Transaction, FundBalance, Category, Person
 from ..schemas import SummaryReportOut, TopEntry
 
 router = APIRouter(prefix="/api/v1/reports", tags=["reports"])
 
+TOP_COLUMNS = ("id", "name", "total_paise")
+EXPORT_TABLES = {
+    "transactions": Transaction.__table__,
+    "people": Person.__table__,
+    "categories": Category.__table__,
+}
+
 
 @router.get("/summary", response_model=SummaryReportOut)
 def summary(posting: bool = True, db: Session = Depends(get_db)):
@@ -47,8 +56,22 @@ def summary(posting: bool = True, db: Session = Depends(get_db)):
     )
 
 
+def _top_response(rows, fields: Optional[str], format: ListFormat):
+    if fields is None and format == "rows":
+        return [TopEntry(id=rid, name=name, total_paise=total) for rid, name, total in rows]
+    columns = parse_fields(fields, TOP_COLUMNS)
+    idx = [TOP_COLUMNS.index(c) for c in columns]
+    return JSONResponse(encode_rows(columns, ([r[i] for i in idx] for r in rows), format))
+
+
 @router.get("/top-categories", response_model=list[TopEntry])
-def top_categories(limit: int = 8, posting: bool = True, db: Session = Depends(get_db)):
+def top_categories(
+    limit: int = 8,
+    posting: bool = True,
+    fields: Optional[str] = None,
+    format: ListFormat = "rows",
+    db: Session = Depends(get_db),
+):
     rows = db.execute(
         select(Transaction.category_id, Category.name, func.sum(Transaction.amount_paise).label("total"))
         .join(Category, Category.id == Transaction.category_id)
@@ -57,11 +80,17 @@ def top_categories(limit: int = 8, posting: bool = True, db: Session = Depends(g
         .order_by(func.sum(Transaction.amount_paise).desc())
         .limit(limit)
     ).all()
-    return [TopEntry(id=cid, name=name, total_paise=total) for cid, name, total in rows]
+    return _top_response(rows, fields, format)
 
 
 @router.get("/top-people", response_model=list[TopEntry])
-def top_people(limit: int = 8, posting: bool = True, db: Session = Depends(get_db)):
+def top_people(
+    limit: int = 8,
+    posting: bool = True,
+    fields: Optional[str] = None,
+    format: ListFormat = "rows",
+    db: Session = Depends(get_db),
+):
     rows = db.execute(
         select(Transaction.person_id, Person.name, func.sum(Transaction.amount_paise).label("total"))
         .join(Person, Person.id == Transaction.person_id)
@@ -70,26 +99,29 @@ def top_people(limit: int = 8, posting: bool = True, db: Session = Depends(get_d
         .order_by(func.sum(Transaction.amount_paise).desc())
         .limit(limit)
     ).all()
-    return [TopEntry(id=pid, name=name, total_paise=total) for pid, name, total in rows]
+    return _top_response(rows, fields, format)
 
 
 @router.get("/export.csv")
-def export_csv(scope: str = "transactions", posting: bool = True, db: Session = Depends(get_db)):
+def export_csv(scope: str = "transactions", posting: bool = True, fields: Optional[str] = None, db: Session = Depends(get_db)):
     buf = io.StringIO()
     writer = csv.writer(buf)
-    if scope == "transactions":
-        writer.writerow(["id","txn_type","amount_paise","date","posting","fund_from","fund_to","person_id","category_id","party","notes"])
-        rows = db.execute(select(Transaction).where(Transaction.posting == posting).order_by(Transaction.date)).scalars().all()
-        for t in rows:
-            writer.writerow([t.id, t.txn_type, t.amount_paise, t.date.isoformat(), int(t.posting), t.fund_from, t.fund_to, t.person_id, t.category_id, (t.party or ""), (t.notes or "")])
-    elif scope == "people":
-        writer.writerow(["id","name"])
-        for p in db.execute(select(Person).order_by(Person.name)).scalars().all():
-            writer.writerow([p.id, p.name])
-    elif scope == "categories":
-        writer.writerow(["id","name"])
-        for c in db.execute(select(Category).order_by(Category.name)).scalars().all():
-            writer.writerow([c.id, c.name])
+    if scope in EXPORT_TABLES:
+        table = EXPORT_TABLES[scope]
+        columns = parse_fields(fields, tuple(c.name for c in table.columns))
+        # Bare column tuples: no ORM hydration, only the requested columns are read
+        stmt = select(*(table.c[f] for f in columns))
+        if scope == "transactions":
+            stmt = stmt.where(table.c.posting == posting).order_by(table.c.date)
+        else:
+            stmt = stmt.order_by(table.c.name)
+        writer.writerow(columns)
+        posting_idx = columns.index("posting") if scope == "transactions" and "posting" in columns else None
+        for row in db.execute(stmt).tuples():
+            if posting_idx is not None:
+                row = list(row)
+                row[posting_idx] = int(row[posting_idx])
+            writer.writerow(row)
     else:
         writer.writerow(["error"]) ; writer.writerow(["unknown scope"])  # simple guard
     return Response(content=buf.getvalue(), media_type="text/csv")
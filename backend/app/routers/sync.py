@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..db import get_db
+from ..models import Category, Person, SyncAppliedOp, SyncChange, SyncMeta, Transaction
+from ..schemas import (
+    CategoryCreate,
+    PersonCreate,
+    SyncOp,
+    SyncOpResult,
+    SyncPullOut,
+    SyncPushIn,
+    SyncPushOut,
+    TransactionCreate,
+)
+from ..write_queue import apply_write
+from .funds import get_funds
+from .transactions import apply_txn_update, clear_txn_refs, insert_txn, remove_txn
+
+router = APIRouter(prefix="/api/v1/sync", tags=["sync"])
+
+MAX_SYNC_LIMIT = 5000
+
+# entity name in sync_changes -> (model, key in the response)
+ENTITIES = {
+    "transaction": (Transaction, "transactions"),
+    "person": (Person, "people"),
+    "category": (Category, "categories"),
+}
+
+
+def _epoch(db: Session) -> str:
+    return db.execute(select(SyncMeta.epoch).where(SyncMeta.id == 1)).scalar_one()
+
+
+@router.get("", response_model=SyncPullOut)
+def pull(since: int = 0, limit: int = 500, epoch: Optional[str] = None, db: Session = Depends(get_db)):
+    """Rows changed after `since`, in seq order; pass `next` back as `since` to continue.
+
+    A row may come back newer than its seq if it changed again mid-read; it is
+    sent again under its later seq, so clients just upsert by id.
+
+    Cursors are only valid within an epoch (a restore starts a new one). Given a
+    stale `epoch`, the pull restarts from seq 0 with reset=true and the client
+    must replace its local copy rather than merge into it.
+    """
+    limit = max(1, min(limit, MAX_SYNC_LIMIT))
+    current = _epoch(db)
+    reset = epoch is not None and epoch != current
+    if reset:
+        since = 0
+    changes = db.execute(
+        select(SyncChange.seq, SyncChange.entity, SyncChange.entity_id, SyncChange.deleted)
+        .where(SyncChange.seq > since)
+        .order_by(SyncChange.seq)
+        .limit(limit + 1)
+    ).all()
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    live: dict[str, list[str]] = {e: [] for e in ENTITIES}
+    deleted: dict[str, list[str]] = {key: [] for _model, key in ENTITIES.values()}
+    for _seq, entity, entity_id, is_deleted in changes:
+        if entity not in ENTITIES:
+            continue
+        if is_deleted:
+            deleted[ENTITIES[entity][1]].append(entity_id)
+        else:
+            live[entity].append(entity_id)
+
+    body = {key: [] for _model, key in ENTITIES.values()}
+    for entity, ids in live.items():
+        if ids:
+            model, key = ENTITIES[entity]
+            body[key] = db.execute(select(model).where(model.id.in_(ids))).scalars().all()
+
+    return {
+        "epoch": current,
+        "reset": reset,
+        "since": since,
+        "next": changes[-1].seq if changes else since,
+        "has_more": has_more,
+        **body,
+        "deleted": deleted,
+        "funds": get_funds(db),
+    }
+
+
+def _apply_op(s: Session, o: SyncOp) -> int:
+    model, _key = ENTITIES[o.entity]
+    existing = s.get(model, o.id)
+    if o.action == "delete":
+        # Deleting something already gone is the idempotent outcome, not an error
+        if existing is None:
+            return 200
+        if o.entity == "transaction":
+            remove_txn(s, existing)
+        else:
+            clear_txn_refs(s, "person_id" if o.entity == "person" else "category_id", o.id)
+            s.delete(existing)
+            s.flush()
+        return 200
+
+    data = {**(o.data or {}), "id": o.id}
+    if o.entity == "transaction":
+        payload = TransactionCreate.model_validate(data)
+        if existing is None:
+            insert_txn(s, o.id, payload)
+            return 201
+        apply_txn_update(s, existing, payload)
+        return 200
+    payload = (PersonCreate if o.entity == "person" else CategoryCreate).model_validate(data)
+    if existing is None:
+        s.add(model(id=o.id, name=payload.name))
+        s.flush()
+        return 201
+    existing.name = payload.name
+    s.flush()
+    return 200
+
+
+@router.post("", response_model=SyncPushOut)
+def push(payload: SyncPushIn, db: Session = Depends(get_db)):
+    """Apply offline-queued client writes; each op is atomic and applied at most once per op_id."""
+    def op(s: Session) -> list[SyncOpResult]:
+        results = []
+        for o in payload.ops:
+            seen = s.get(SyncAppliedOp, o.op_id)
+            if seen is not None:
+                stored = json.loads(seen.result)
+                results.append(SyncOpResult(op_id=o.op_id, status="duplicate", **stored))
+                continue
+            try:
+                with s.begin_nested():
+                    code = _apply_op(s, o)
+                    s.add(SyncAppliedOp(op_id=o.op_id, result=json.dumps({"status_code": code})))
+                results.append(SyncOpResult(op_id=o.op_id, status="applied", status_code=code))
+            except HTTPException as exc:
+                results.append(SyncOpResult(op_id=o.op_id, status="error", status_code=exc.status_code, detail=str(exc.detail)))
+            except ValidationError as exc:
+                results.append(SyncOpResult(op_id=o.op_id, status="error", status_code=422, detail=str(exc)))
+            except IntegrityError as exc:
+                results.append(SyncOpResult(op_id=o.op_id, status="error", status_code=409, detail=str(exc.orig)))
+        return results
+
+    results = apply_write(db, op)
+    seq = db.execute(select(func.coalesce(func.max(SyncChange.seq), 0))).scalar_one()
+    return {"epoch": _epoch(db), "results": results, "seq": seq, "funds": get_funds(db)}
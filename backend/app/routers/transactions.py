@@ -1,25 +1,42 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Optional
+from typing import Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session
 
 from ..db import get_db
 from ..models import Transaction, Person, Category
-from ..schemas import TransactionCreate, TransactionOut, TransactionUpdate
+from ..facets import cached_counts
+from ..fieldsets import ListFormat, encode_rows, parse_fields
+from ..journal import record_delete, record_insert, record_update, row_of
+from ..schemas import TransactionBase, TransactionCreate, TransactionOut, TransactionPageOut, TransactionUpdate
+from ..write_queue import apply_write
 
 router = APIRouter(prefix="/api/v1/transactions", tags=["transactions"])
 
+PAGE_SIZE = 100
+TXN_COLUMNS = tuple(c.name for c in Transaction.__table__.columns)
+
 
 @router.post("", response_model=TransactionOut)
 def create_txn(payload: TransactionCreate, db: Session = Depends(get_db)):
     # Upstream schema validation already performed
     tid = payload.id or f"t{(abs(hash((payload.txn_type, payload.amount_paise, payload.date))%10**8)):08d}"
-    if db.get(Transaction, tid):
-        raise HTTPException(status_code=409, detail="transaction id already exists")
+
+    def op(s: Session) -> TransactionOut:
+        if s.get(Transaction, tid):
+            raise HTTPException(status_code=409, detail="transaction id already exists")
+        return TransactionOut.model_validate(insert_txn(s, tid, payload))
+
+    return apply_write(db, op)
+
+
+def insert_txn(s: Session, tid: str, payload: TransactionBase) -> Transaction:
+    """Add and journal a new transaction (no commit)."""
     t = Transaction(
         id=tid,
         txn_type=payload.txn_type,
@@ -33,26 +50,59 @@ def create_txn(payload: TransactionCreate, db: Session = Depends(get_db)):
         party=payload.party,
         notes=payload.notes,
     )
-    db.add(t)
-    db.commit()
-    db.refresh(t)
+    s.add(t)
+    s.flush()
+    record_insert(s, t)
     return t
 
 
-@router.get("", response_model=list[TransactionOut])
-def list_txns(
-    type: Optional[str] = Query(None, alias="type"),
-    fund: Optional[str] = None,
-    category_id: Optional[str] = None,
-    person_id: Optional[str] = None,
-    from_date: Optional[date] = Query(None, alias="from"),
-    to: Optional[date] = None,
-    posting: Optional[bool] = None,
-    q: Optional[str] = None,
-    page: int = 1,
-    db: Session = Depends(get_db),
-):
-    stmt = select(Transaction)
+def apply_txn_update(s: Session, t: Transaction, payload: TransactionBase) -> None:
+    """Overwrite all fields of t from payload and journal the change (no commit)."""
+    before = row_of(t)
+    # Assign all fields
+    t.txn_type = payload.txn_type
+    t.amount_paise = payload.amount_paise
+    t.date = payload.date
+    t.posting = payload.posting
+    t.fund_from = payload.fund_from
+    t.fund_to = payload.fund_to
+    t.person_id = payload.person_id
+    t.category_id = payload.category_id
+    t.party = payload.party
+    t.notes = payload.notes
+    s.flush()
+    record_update(s, before, t)
+
+
+def remove_txn(s: Session, t: Transaction) -> None:
+    """Delete and journal t (no commit)."""
+    s.delete(t)
+    s.flush()
+    record_delete(s, t)
+
+
+def clear_txn_refs(s: Session, column: str, ref_id: str) -> None:
+    """Null person_id/category_id on transactions referencing a row about to be
+    deleted, journaling each change (no commit)."""
+    txns = s.execute(select(Transaction).where(getattr(Transaction, column) == ref_id)).scalars().all()
+    befores = [row_of(t) for t in txns]
+    for t in txns:
+        setattr(t, column, None)
+    s.flush()
+    for before, t in zip(befores, txns):
+        record_update(s, before, t)
+
+
+def _filter_conds(
+    type: Optional[str],
+    fund: Optional[str],
+    category_id: Optional[str],
+    person_id: Optional[str],
+    from_date: Optional[date],
+    to: Optional[date],
+    posting: Optional[bool],
+    q: Optional[str],
+) -> list:
     conds = []
     if type:
         conds.append(Transaction.txn_type == type)
@@ -71,10 +121,61 @@ def list_txns(
     if q:
         like = f"%{q}%"
         conds.append(or_(Transaction.notes.like(like), Transaction.party.like(like)))
+    return conds
+
+
+def _counts(db: Session, conds: list, *filters) -> dict:
+    # Empty strings are "no filter" in _filter_conds, so normalize them the same way in the key
+    key = tuple(None if f == "" else f for f in filters)
+    return cached_counts(db, key, conds)
+
+
+def _pages(total: int) -> int:
+    return max(1, -(-total // PAGE_SIZE))
+
+
+@router.get("", response_model=Union[TransactionPageOut, list[TransactionOut]])
+def list_txns(
+    type: Optional[str] = Query(None, alias="type"),
+    fund: Optional[str] = None,
+    category_id: Optional[str] = None,
+    person_id: Optional[str] = None,
+    from_date: Optional[date] = Query(None, alias="from"),
+    to: Optional[date] = None,
+    posting: Optional[bool] = None,
+    q: Optional[str] = None,
+    page: int = 1,
+    with_counts: bool = False,
+    fields: Optional[str] = None,
+    format: ListFormat = "rows",
+    db: Session = Depends(get_db),
+):
+    conds = _filter_conds(type, fund, category_id, person_id, from_date, to, posting, q)
+    sparse = fields is not None or format != "rows"
+    columns = parse_fields(fields, TXN_COLUMNS)
+    # Sparse/columnar reads select bare columns and skip ORM + pydantic hydration
+    stmt = select(*(Transaction.__table__.c[f] for f in columns)) if sparse else select(Transaction)
     if conds:
         stmt = stmt.where(and_(*conds))
-    stmt = stmt.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(100).offset((page - 1) * 100)
-    return db.execute(stmt).scalars().all()
+    stmt = stmt.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(PAGE_SIZE).offset((page - 1) * PAGE_SIZE)
+    if sparse:
+        body = encode_rows(columns, db.execute(stmt).tuples(), format)
+        if with_counts:
+            counts = _counts(db, conds, type, fund, category_id, person_id, from_date, to, posting, q)
+            extra = {"total": counts["total"], "page": page, "pages": _pages(counts["total"]), "facets": counts["facets"]}
+            body = {**body, **extra} if format == "columnar" else {"items": body, **extra}
+        return JSONResponse(body)
+    items = db.execute(stmt).scalars().all()
+    if not with_counts:
+        return items
+    counts = _counts(db, conds, type, fund, category_id, person_id, from_date, to, posting, q)
+    return TransactionPageOut(
+        items=[TransactionOut.model_validate(t) for t in items],
+        total=counts["total"],
+        page=page,
+        pages=_pages(counts["total"]),
+        facets=counts["facets"],
+    )
 
 
 @router.get("/{txn_id}", response_model=TransactionOut)
@@ -87,30 +188,23 @@ def get_txn(txn_id: str, db: Session = Depends(get_db)):
 
 @router.put("/{txn_id}", response_model=TransactionOut)
 def update_txn(txn_id: str, payload: TransactionUpdate, db: Session = Depends(get_db)):
-    t = db.get(Transaction, txn_id)
-    if not t:
-        raise HTTPException(status_code=404, detail="transaction not found")
-    # Assign all fields
-    t.txn_type = payload.txn_type
-    t.amount_paise = payload.amount_paise
-    t.date = payload.date
-    t.posting = payload.posting
-    t.fund_from = payload.fund_from
-    t.fund_to = payload.fund_to
-    t.person_id = payload.person_id
-    t.category_id = payload.category_id
-    t.party = payload.party
-    t.notes = payload.notes
-    db.commit()
-    db.refresh(t)
-    return t
+    def op(s: Session) -> TransactionOut:
+        t = s.get(Transaction, txn_id)
+        if not t:
+            raise HTTPException(status_code=404, detail="transaction not found")
+        apply_txn_update(s, t, payload)
+        return TransactionOut.model_validate(t)
+
+    return apply_write(db, op)
 
 
 @router.delete("/{txn_id}")
 def delete_txn(txn_id: str, db: Session = Depends(get_db)):
-    t = db.get(Transaction, txn_id)
-    if not t:
-        raise HTTPException(status_code=404, detail="transaction not found")
-    db.delete(t)
-    db.commit()
-    return {"ok": True}
+    def op(s: Session) -> dict:
+        t = s.get(Transaction, txn_id)
+        if not t:
+            raise HTTPException(status_code=404, detail="transaction not found")
+        remove_txn(s, t)
+        return {"ok": True}
+
+    return apply_write(db, op)
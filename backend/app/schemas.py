@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from datetime import date
+import json
+from datetime import date, datetime
 from typing import Literal, Optional
 
 from pydantic import BaseModel, field_validator, model_validator
@@ -119,6 +120,14 @@ class TransactionOut(TransactionBase):
         from_attributes = True
 
 
+class TransactionPageOut(BaseModel):
+    items: list[TransactionOut]
+    total: int
+    page: int
+    pages: int
+    facets: dict[str, dict[str, int]]
+
+
 class SummaryReportOut(BaseModel):
     total_contributions: int
     total_income: int
@@ -131,3 +140,85 @@ class TopEntry(BaseModel):
     id: Optional[str]
     name: Optional[str]
     total_paise: int
+
+
+class JournalEntryOut(BaseModel):
+    id: int
+    created_at: datetime
+    entity: str
+    entity_id: str
+    op: str
+    delta: dict
+    undo_of: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+    @field_validator("delta", mode="before")
+    @classmethod
+    def parse_delta(cls, v):
+        return json.loads(v) if isinstance(v, str) else v
+
+
+class JournalSnapshotOut(BaseModel):
+    id: int
+    journal_id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class RebuildOut(BaseModel):
+    journal_id: int
+    base_journal_id: int
+    replayed: int
+    funds: dict[str, int]
+    totals: dict[str, int]
+    stored_funds: dict[str, int]
+    discrepancy: dict[str, int]
+
+
+class SyncDeleted(BaseModel):
+    transactions: list[str] = []
+    people: list[str] = []
+    categories: list[str] = []
+
+
+class SyncPullOut(BaseModel):
+    epoch: str
+    reset: bool = False
+    since: int
+    next: int
+    has_more: bool
+    transactions: list[TransactionOut]
+    people: list[PersonOut]
+    categories: list[CategoryOut]
+    deleted: SyncDeleted
+    funds: FundBalancesOut
+
+
+class SyncOp(BaseModel):
+    op_id: str
+    action: Literal["upsert", "delete"]
+    entity: Literal["transaction", "person", "category"]
+    id: str
+    data: Optional[dict] = None
+
+
+class SyncPushIn(BaseModel):
+    ops: list[SyncOp]
+
+
+class SyncOpResult(BaseModel):
+    op_id: str
+    status: Literal["applied", "duplicate", "error"]
+    status_code: int
+    detail: Optional[str] = None
+
+
+class SyncPushOut(BaseModel):
+    epoch: str
+    results: list[SyncOpResult]
+    seq: int
+    funds: FundBalancesOut
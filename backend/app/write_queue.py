@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+
+from .db import SessionLocal
+
+T = TypeVar("T")
+WriteOp = Callable[[Session], T]
+
+WRITE_QUEUE_ENABLED = os.environ.get("HISAB_WRITE_QUEUE", "0") == "1"
+WRITE_QUEUE_WINDOW_MS = float(os.environ.get("HISAB_WRITE_QUEUE_WINDOW_MS", "2"))
+WRITE_QUEUE_MAX_BATCH = int(os.environ.get("HISAB_WRITE_QUEUE_MAX_BATCH", "64"))
+
+
+class WriteQueue:
+    """Group-commit pipeline: one writer thread applies queued ops in shared transactions.
+
+    Each op runs inside its own SAVEPOINT so a failing op (404, 409, constraint
+    error) only rolls back itself; the rest of the batch commits together.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        window_ms: float = WRITE_QUEUE_WINDOW_MS,
+        max_batch: int = WRITE_QUEUE_MAX_BATCH,
+    ) -> None:
+        self.session_factory = session_factory
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue: queue.Queue[Optional[tuple[WriteOp, Future]]] = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._worker, name="write-queue", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, op: WriteOp) -> Future:
+        fut: Future = Future()
+        self._queue.put((op, fut))
+        return fut
+
+    def run(self, op: WriteOp[T]) -> T:
+        """Enqueue op and block until its batch has committed."""
+        return self.submit(op).result()
+
+    def _gather(self, first: tuple[WriteOp, Future]) -> tuple[list[tuple[WriteOp, Future]], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _worker(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stopping = self._gather(first)
+            self._apply(batch)
+
+    def _apply(self, batch: list[tuple[WriteOp, Future]]) -> None:
+        results: list[tuple[Future, object, Optional[BaseException]]] = []
+        with self.session_factory() as db:
+            try:
+                # pysqlite does not emit BEGIN before SAVEPOINT; without an explicit
+                # outer transaction each RELEASE would commit on its own.
+                db.execute(text("BEGIN IMMEDIATE"))
+                for op, fut in batch:
+                    try:
+                        with db.begin_nested():
+                            result = op(db)
+                        results.append((fut, result, None))
+                    except Exception as exc:
+                        results.append((fut, None, exc))
+                db.commit()
+            except Exception as exc:
+                db.rollback()
+                for _op, fut in batch:
+                    fut.set_exception(exc)
+                return
+        for fut, result, exc in results:
+            if exc is not None:
+                fut.set_exception(exc)
+            else:
+                fut.set_result(result)
+
+
+write_queue = WriteQueue(SessionLocal)
+
+
+def apply_write(db: Session, op: WriteOp[T]) -> T:
+    """Run a mutation through the write queue when it is running, else commit on db.
+
+    op must not commit and must return plain data (not ORM instances), since the
+    queue's session is closed before the caller sees the result.
+    """
+    if write_queue.running:
+        return write_queue.run(op)
+    # pysqlite runs SELECTs outside any transaction, so take the write lock before
+    # op reads the rows it changes (and journals as "before"), as _apply does.
+    if not db.connection().connection.dbapi_connection.in_transaction:
+        db.execute(text("BEGIN IMMEDIATE"))
+    db.expire_all()
+    try:
+        result = op(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result
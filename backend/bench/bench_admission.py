@@ -0,0 +1,120 @@
+"""Interactive p50/p99 under a mixed load of full-ledger exports, with and without admission control.
+
+Usage: python bench/bench_admission.py [ledger_rows] [seconds]
+Each mode runs in a fresh subprocess (HISAB_ADMISSION=0/1) against the ASGI app
+in-process, so requests go through the same threadpool as under uvicorn.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+BACKEND_ROOT = CURRENT_DIR.parent
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+HEAVY_CLIENTS = 8
+INTERACTIVE_CLIENTS = 4
+
+
+def _build(rows: int) -> None:
+    from sqlalchemy import insert
+
+    from app.db import SessionLocal
+    from app.main import on_startup
+    from app.models import Person, Transaction
+
+    on_startup()
+    with SessionLocal() as db:
+        db.merge(Person(id="p_a", name="A"))
+        start = date(2020, 1, 1)
+        db.execute(insert(Transaction), [
+            {
+                "id": f"t{i:08d}", "txn_type": "CONTRIBUTION", "amount_paise": 100 + i % 5000,
+                "date": start + timedelta(days=i % 1500), "posting": True, "fund_to": "CASH",
+                "person_id": "p_a", "notes": "monthly share",
+            }
+            for i in range(rows)
+        ])
+        db.commit()
+
+
+async def _run(seconds: float, heavy_clients: int) -> None:
+    import httpx
+
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    deadline = time.monotonic() + seconds
+    interactive: dict[str, list[float]] = {"GET /funds": [], "POST /transactions": []}
+    heavy = {"ok": 0, "rejected": 0}
+
+    async def heavy_client(c: httpx.AsyncClient) -> None:
+        while time.monotonic() < deadline:
+            r = await c.get("/api/v1/reports/export.csv")
+            if r.status_code == 503:
+                heavy["rejected"] += 1
+                await asyncio.sleep(min(float(r.headers.get("Retry-After", "1")), 0.5))
+            else:
+                heavy["ok"] += 1
+
+    async def interactive_client(c: httpx.AsyncClient, n: int) -> None:
+        i = 0
+        while time.monotonic() < deadline:
+            t0 = time.perf_counter()
+            route = "POST /transactions" if i % 2 else "GET /funds"
+            if i % 2:
+                await c.post("/api/v1/transactions", json={
+                    "id": f"i{n}_{i}", "txn_type": "CONTRIBUTION", "amount_paise": 100,
+                    "date": "2024-01-01", "fund_to": "CASH", "person_id": "p_a",
+                })
+            else:
+                await c.get("/api/v1/funds")
+            interactive[route].append(time.perf_counter() - t0)
+            i += 1
+            await asyncio.sleep(0.02)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as c:
+        await asyncio.gather(
+            *(heavy_client(c) for _ in range(heavy_clients)),
+            *(interactive_client(c, n) for n in range(INTERACTIVE_CLIENTS)),
+        )
+
+    mode = "idle (no exports)" if not heavy_clients else (
+        "admission on" if os.environ.get("HISAB_ADMISSION") == "1" else "admission off")
+    print(f"{mode}: exports ok={heavy['ok']} rejected={heavy['rejected']}")
+    for route, lat in interactive.items():
+        ms = sorted(x * 1000 for x in lat)
+        p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+        print(f"  {route:<20} n={len(ms):<5} p50={statistics.median(ms):8.1f}ms p99={p99:8.1f}ms")
+
+
+def _child(rows: int, seconds: float, heavy_clients: int) -> None:
+    _build(rows)
+    asyncio.run(_run(seconds, heavy_clients))
+
+
+def main(rows: int = 30_000, seconds: float = 8.0) -> None:
+    for admission, heavy_clients in (("0", 0), ("0", HEAVY_CLIENTS), ("1", HEAVY_CLIENTS)):
+        tmp = tempfile.mkdtemp(prefix="hisab_bench_")
+        env = {**os.environ, "HISAB_ADMISSION": admission, "HISAB_DATABASE_URL": f"sqlite:///{tmp}/bench.db"}
+        subprocess.run(
+            [sys.executable, __file__, "--child", str(rows), str(seconds), str(heavy_clients)],
+            env=env, check=True, stdout=sys.stdout,
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        _child(int(sys.argv[2]), float(sys.argv[3]), int(sys.argv[4]))
+    else:
+        args = sys.argv[1:]
+        main(int(args[0]) if args else 30_000, float(args[1]) if len(args) > 1 else 8.0)
@@ -0,0 +1,127 @@
+"""Backup time and request slowdown while a paced online backup runs.
+
+Usage: python bench/bench_backup.py [ledger_rows]
+Builds a throwaway ledger, then for several pages-per-step settings measures the
+backup wall time and the p50/p99 of a mixed read/write request loop running
+alongside it, compared with the same loop on an idle database.
+"""
+from __future__ import annotations
+
+import itertools
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+BACKEND_ROOT = CURRENT_DIR.parent
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+TMP_DIR = Path(tempfile.mkdtemp(prefix="hisab_bench_"))
+os.environ["HISAB_DATABASE_URL"] = f"sqlite:///{TMP_DIR}/bench.db"
+
+from sqlalchemy import insert
+
+from app import backup
+from app.db import Base, SessionLocal, create_triggers_if_missing, engine
+from app.models import FundBalance, Transaction
+from app.routers.funds import get_funds
+from app.routers.reports import summary
+
+SETTINGS = ((-1, 0), (64, 5), (256, 5), (1024, 5))
+REPEATS = 3
+_ids = itertools.count()
+
+
+def _build(rows: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    create_triggers_if_missing()
+    start = date(2020, 1, 1)
+    with SessionLocal() as db:
+        for fund in ("CASH", "ONLINE_A", "ONLINE_Y"):
+            db.merge(FundBalance(fund=fund, balance_paise=0))
+        batch = []
+        for i in range(rows):
+            batch.append({
+                "id": f"t{i:08d}", "txn_type": "EXPENSE", "amount_paise": 100 + i % 5000,
+                "date": start + timedelta(days=i % 1500), "posting": False,
+                "fund_from": "CASH", "notes": "groceries and household items " * 2,
+            })
+            if len(batch) == 5000:
+                db.execute(insert(Transaction), batch)
+                batch.clear()
+        if batch:
+            db.execute(insert(Transaction), batch)
+        db.commit()
+
+
+def _requests(stop: threading.Event, latencies: list[float]) -> None:
+    while not stop.is_set():
+        n = next(_ids)
+        t0 = time.perf_counter()
+        with SessionLocal() as db:
+            if n % 4 == 0:
+                db.add(Transaction(
+                    id=f"w{n:08d}", txn_type="INCOME", amount_paise=100,
+                    date=date(2024, 1, 1), posting=True, fund_to="CASH",
+                ))
+                db.commit()
+            elif n % 4 == 1:
+                summary(posting=True, db=db)
+            else:
+                get_funds(db)
+        latencies.append(time.perf_counter() - t0)
+
+
+def _load(duration: float | None, during=None) -> tuple[list[float], float]:
+    stop = threading.Event()
+    lat: list[float] = []
+    t = threading.Thread(target=_requests, args=(stop, lat))
+    t.start()
+    elapsed = 0.0
+    if during is not None:
+        t0 = time.perf_counter()
+        during()
+        elapsed = time.perf_counter() - t0
+    else:
+        time.sleep(duration)
+    stop.set()
+    t.join()
+    return lat, elapsed
+
+
+def _fmt(lat: list[float]) -> str:
+    ms = sorted(x * 1000 for x in lat)
+    if not ms:
+        return "reqs=0"
+    p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+    return f"reqs={len(ms):<6} p50={statistics.median(ms):6.2f}ms p99={p99:7.2f}ms"
+
+
+def main(rows: int = 200_000) -> None:
+    _build(rows)
+    size_mb = backup.database_path().stat().st_size / 1e6
+    print(f"ledger: {rows} rows, {size_mb:.1f} MB")
+    lat, _ = _load(2.0)
+    print(f"{'idle':<24} {'':>9}  {_fmt(lat)}")
+    dest = TMP_DIR / "copy.db"
+    for pages, pause in SETTINGS:
+        def run() -> None:
+            for _ in range(REPEATS):
+                dest.unlink(missing_ok=True)
+                backup.backup_to(dest, pages=pages, pause_ms=pause)
+        lat, elapsed = _load(None, during=run)
+        label = "single step" if pages < 0 else f"{pages} pages/{pause}ms"
+        print(f"{label:<24} {elapsed / REPEATS:8.2f}s  {_fmt(lat)}")
+    t0 = time.perf_counter()
+    snap = backup.create_snapshot(TMP_DIR / "snaps")
+    print(f"gzip snapshot: {time.perf_counter() - t0:.2f}s, {snap.stat().st_size / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
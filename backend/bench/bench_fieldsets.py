@@ -0,0 +1,98 @@
+"""Payload size and server CPU for full vs sparse vs columnar transaction lists.
+
+Usage: python bench/bench_fieldsets.py
+"full" mirrors the default list path (ORM rows validated into TransactionOut and
+dumped as JSON); the others select bare columns and go through encode_rows.
+"""
+from __future__ import annotations
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+BACKEND_ROOT = CURRENT_DIR.parent
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+TMP_DIR = Path(tempfile.mkdtemp(prefix="hisab_bench_"))
+os.environ["HISAB_DATABASE_URL"] = f"sqlite:///{TMP_DIR}/bench.db"
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+
+from app.db import Base, SessionLocal, create_indexes_if_missing, engine
+from app.fieldsets import encode_rows
+from app.models import Transaction
+from app.routers.transactions import TXN_COLUMNS
+from app.schemas import TransactionOut
+
+SIZES = (100, 1_000, 10_000)
+LIST_FIELDS = ["id", "date", "amount_paise", "txn_type", "fund_from", "fund_to"]
+RUNS = 15
+FULL_ADAPTER = TypeAdapter(list[TransactionOut])
+
+
+def _build(rows: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    start = date(2020, 1, 1)
+    with SessionLocal() as db:
+        db.execute(insert(Transaction), [
+            {
+                "id": f"t{i:08d}", "txn_type": "EXPENSE", "amount_paise": 100 + i % 5000,
+                "date": start + timedelta(days=i % 1500), "posting": True, "fund_from": "CASH",
+                "category_id": f"cat_{i % 12}", "party": "Local store", "notes": "weekly groceries",
+            }
+            for i in range(rows)
+        ])
+        db.commit()
+    create_indexes_if_missing()
+
+
+def _ordered(stmt, n: int):
+    return stmt.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(n)
+
+
+def _full(n: int) -> bytes:
+    with SessionLocal() as db:
+        items = db.execute(_ordered(select(Transaction), n)).scalars().all()
+        return FULL_ADAPTER.dump_json(FULL_ADAPTER.validate_python(items, from_attributes=True))
+
+
+def _sparse(n: int, columns: list[str], format: str) -> bytes:
+    with SessionLocal() as db:
+        stmt = _ordered(select(*(Transaction.__table__.c[f] for f in columns)), n)
+        return JSONResponse(encode_rows(columns, db.execute(stmt).tuples(), format)).body
+
+
+def _measure(fn) -> tuple[int, float]:
+    cpu = []
+    for _ in range(RUNS):
+        t0 = time.process_time()
+        body = fn()
+        cpu.append(time.process_time() - t0)
+    return len(body), statistics.median(cpu) * 1000
+
+
+def main() -> None:
+    _build(max(SIZES))
+    variants = (
+        ("full (11 fields)", _full),
+        ("fields=6, rows", lambda n: _sparse(n, LIST_FIELDS, "rows")),
+        ("fields=6, columnar", lambda n: _sparse(n, LIST_FIELDS, "columnar")),
+        ("all fields, columnar", lambda n: _sparse(n, list(TXN_COLUMNS), "columnar")),
+    )
+    print(f"{'variant':<22} {'rows':>6} {'bytes':>10} {'cpu':>10}")
+    for n in SIZES:
+        for label, fn in variants:
+            size, cpu_ms = _measure(lambda: fn(n))
+            print(f"{label:<22} {n:>6} {size:>10} {cpu_ms:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
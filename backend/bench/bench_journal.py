@@ -0,0 +1,106 @@
+"""Journal write overhead and rebuild time from the latest snapshot vs from the start.
+
+Usage: python bench/bench_journal.py [entries]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+BACKEND_ROOT = CURRENT_DIR.parent
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+TMP_DIR = Path(tempfile.mkdtemp(prefix="hisab_bench_"))
+os.environ["HISAB_DATABASE_URL"] = f"sqlite:///{TMP_DIR}/bench.db"
+
+from sqlalchemy import delete
+
+from app import journal
+from app.db import Base, SessionLocal, create_triggers_if_missing, engine
+from app.models import FundBalance, JournalEntry, JournalSnapshot, Transaction
+
+WRITE_SAMPLE = 2_000
+COMMIT_EVERY = 100
+
+
+def _reset() -> None:
+    Base.metadata.create_all(bind=engine)
+    create_triggers_if_missing()
+    with SessionLocal() as db:
+        for model in (Transaction, JournalEntry, JournalSnapshot):
+            db.execute(delete(model))
+        for fund in ("CASH", "ONLINE_A", "ONLINE_Y"):
+            db.merge(FundBalance(fund=fund, balance_paise=0))
+        db.commit()
+        journal.ensure_genesis_snapshot(db)
+
+
+def _txn(i: int) -> Transaction:
+    return Transaction(
+        id=f"t{i:08d}", txn_type=("INCOME", "EXPENSE")[i % 2], amount_paise=100 + i % 5000,
+        date=date(2020, 1, 1) + timedelta(days=i % 1500), posting=True,
+        fund_from="CASH" if i % 2 else None, fund_to=None if i % 2 else "ONLINE_A",
+        category_id="cat_food" if i % 2 else None, notes="household",
+    )
+
+
+def _write(n: int, journaled: bool) -> float:
+    t0 = time.perf_counter()
+    with SessionLocal() as db:
+        for i in range(n):
+            t = _txn(i)
+            db.add(t)
+            db.flush()
+            if journaled:
+                journal.record_insert(db, t)
+            if i % COMMIT_EVERY == COMMIT_EVERY - 1:
+                db.commit()
+        db.commit()
+    return time.perf_counter() - t0
+
+
+def _timed_replay(from_start: bool) -> tuple[float, dict]:
+    with SessionLocal() as db:
+        t0 = time.perf_counter()
+        state = journal.replay(db, from_start=from_start)
+        return time.perf_counter() - t0, state
+
+
+def main(entries: int = 50_000) -> None:
+    _reset()
+    plain = _write(WRITE_SAMPLE, journaled=False)
+    _reset()
+    logged = _write(WRITE_SAMPLE, journaled=True)
+    print(f"writes ({WRITE_SAMPLE}, commit every {COMMIT_EVERY}): "
+          f"plain {plain / WRITE_SAMPLE * 1e6:.0f}us/op, journaled {logged / WRITE_SAMPLE * 1e6:.0f}us/op "
+          f"(+{(logged / plain - 1) * 100:.0f}%)")
+
+    _reset()
+    _write(entries, journaled=True)
+    with SessionLocal() as db:
+        journal.compact(db)
+        db.commit()
+    # A tail of entries after the latest snapshot, as between periodic compactions
+    with SessionLocal() as db:
+        for i in range(entries, entries + journal.JOURNAL_SNAPSHOT_EVERY // 2):
+            t = _txn(i)
+            db.add(t)
+            db.flush()
+            journal.record_insert(db, t)
+        db.commit()
+        stored = journal.current_funds(db)
+
+    for label, from_start in (("from latest snapshot", False), ("from start", True)):
+        elapsed, state = _timed_replay(from_start)
+        ok = "match" if state["funds"] == stored else "MISMATCH"
+        print(f"rebuild {label:<22} {elapsed * 1000:9.1f}ms  replayed={state['replayed']:<7} funds {ok}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,101 @@
+"""Latency of GET /transactions with and without ?with_counts (cold and warm facet cache).
+
+Usage: python bench/bench_list_counts.py [ledger_rows]
+Both variants go through the ASGI app, so validation and JSON encoding of the
+page are in every column and the difference is the cost of the counts.
+"""
+from __future__ import annotations
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+BACKEND_ROOT = CURRENT_DIR.parent
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+TMP_DIR = Path(tempfile.mkdtemp(prefix="hisab_bench_"))
+os.environ["HISAB_DATABASE_URL"] = f"sqlite:///{TMP_DIR}/bench.db"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from app.db import Base, SessionLocal, create_indexes_if_missing, create_triggers_if_missing, engine
+from app.facets import facet_cache
+from app.main import app
+from app.models import Transaction
+
+TYPES = ("CONTRIBUTION", "INCOME", "EXPENSE", "TRANSFER")
+FUNDS = ("CASH", "ONLINE_A", "ONLINE_Y")
+FILTERS = (
+    {},
+    {"type": "EXPENSE"},
+    {"fund": "CASH"},
+    {"from": "2022-01-01", "to": "2022-12-31"},
+)
+RUNS = 30
+
+
+def _build(rows: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    create_triggers_if_missing()
+    start = date(2020, 1, 1)
+    with SessionLocal() as db:
+        batch = []
+        for i in range(rows):
+            t = TYPES[i % 4]
+            batch.append({
+                "id": f"t{i:08d}", "txn_type": t, "amount_paise": 100 + i % 5000,
+                "date": start + timedelta(days=i % 1500), "posting": i % 3 != 0,
+                "fund_from": FUNDS[i % 3] if t in ("EXPENSE", "TRANSFER") else None,
+                "fund_to": FUNDS[(i + 1) % 3] if t != "EXPENSE" else None,
+                "category_id": f"cat_{i % 12}" if t == "EXPENSE" else None,
+                "person_id": f"p_{i % 5}" if t == "CONTRIBUTION" else None,
+            })
+            if len(batch) == 5000:
+                db.execute(insert(Transaction), batch)
+                batch.clear()
+        if batch:
+            db.execute(insert(Transaction), batch)
+        db.commit()
+    # Same as app startup on an existing ledger: indexes plus planner stats
+    create_indexes_if_missing()
+
+
+def _call(client: TestClient, filters: dict, with_counts: bool) -> float:
+    params = {"page": 3, **filters}
+    if with_counts:
+        params["with_counts"] = "true"
+    t0 = time.perf_counter()
+    r = client.get("/api/v1/transactions", params=params)
+    elapsed = time.perf_counter() - t0
+    r.raise_for_status()
+    return elapsed
+
+
+def _ms(samples: list[float]) -> str:
+    return f"{statistics.median(samples) * 1000:7.2f}ms"
+
+
+def main(rows: int = 100_000) -> None:
+    _build(rows)
+    client = TestClient(app)
+    print(f"ledger: {rows} rows, page 3, median of {RUNS}")
+    print(f"{'filter':<40} {'plain':>9} {'counts cold':>12} {'counts warm':>12}")
+    for filters in FILTERS:
+        plain = [_call(client, filters, False) for _ in range(RUNS)]
+        cold = []
+        for _ in range(RUNS):
+            facet_cache.clear()
+            cold.append(_call(client, filters, True))
+        warm = [_call(client, filters, True) for _ in range(RUNS)]
+        label = ",".join(f"{k}={v}" for k, v in filters.items()) or "(none)"
+        print(f"{label:<40} {_ms(plain):>9} {_ms(cold):>12} {_ms(warm):>12}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
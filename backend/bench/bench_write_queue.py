@@ -0,0 +1,109 @@
+"""Writes/sec and latency for per-request commits vs the group-commit write queue.
+
+Usage: python bench/bench_write_queue.py [ops_per_worker]
+Runs against a throwaway SQLite file, never the real ledger.
+"""
+from __future__ import annotations
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+BACKEND_ROOT = CURRENT_DIR.parent
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+TMP_DIR = tempfile.mkdtemp(prefix="hisab_bench_")
+os.environ["HISAB_DATABASE_URL"] = f"sqlite:///{TMP_DIR}/bench.db"
+
+from sqlalchemy import delete
+
+from app.db import Base, SessionLocal, create_triggers_if_missing, engine
+from app.models import FundBalance, Transaction
+from app.write_queue import WriteQueue
+
+CONCURRENCY = (1, 2, 4, 8, 16, 32, 64)
+
+
+def _setup() -> None:
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.execute(delete(Transaction))
+        for fund in ("CASH", "ONLINE_A", "ONLINE_Y"):
+            db.merge(FundBalance(fund=fund, balance_paise=0))
+        db.commit()
+    create_triggers_if_missing()
+
+
+def _insert_op(tid: str):
+    def op(db):
+        db.add(Transaction(
+            id=tid, txn_type="INCOME", amount_paise=100, date=date(2024, 1, 1),
+            posting=True, fund_to="CASH",
+        ))
+        db.flush()
+        return tid
+    return op
+
+
+def _direct(tid: str) -> None:
+    with SessionLocal() as db:
+        _insert_op(tid)(db)
+        db.commit()
+
+
+def _run(workers: int, ops: int, write) -> tuple[float, list[float], int]:
+    latencies: list[float] = []
+    lock = threading.Lock()
+    errors: list[BaseException] = []
+
+    def worker(w: int) -> None:
+        mine = []
+        for i in range(ops):
+            t0 = time.perf_counter()
+            try:
+                write(f"b{w}_{i}")
+            except Exception as exc:  # "database is locked" shows up here
+                errors.append(exc)
+            mine.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(workers)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    return elapsed, latencies, len(errors)
+
+
+def _report(label: str, workers: int, ops: int, elapsed: float, lat: list[float], errors: int) -> None:
+    lat_ms = sorted(x * 1000 for x in lat)
+    p50 = statistics.median(lat_ms)
+    p99 = lat_ms[min(len(lat_ms) - 1, int(len(lat_ms) * 0.99))]
+    print(f"{label:<8} c={workers:<3} {workers * ops / elapsed:9.0f} writes/s  p50={p50:7.2f}ms  p99={p99:7.2f}ms  errors={errors}")
+
+
+def main(ops: int = 50) -> None:
+    wq = WriteQueue(SessionLocal)
+    for workers in CONCURRENCY:
+        _setup()
+        _report("direct", workers, ops, *_run(workers, ops, _direct))
+
+        _setup()
+        wq.start()
+        result = _run(workers, ops, lambda tid: wq.run(_insert_op(tid)))
+        wq.stop()
+        _report("queued", workers, ops, *result)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
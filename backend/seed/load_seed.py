@@ -13,12 +13,15 @@ if str(BACKEND_ROOT) not in sys.path:
 
 from sqlalchemy import select
 
-from app.db import SessionLocal, Base, engine
+from app.db import SessionLocal, Base, engine, create_triggers_if_missing
+from app.journal import record_fund_set, record_insert
 from app.models import FundBalance, Person, Category, Transaction
 
 
 def load_seed(seed_path: str | None = None) -> None:
     Base.metadata.create_all(bind=engine)
+    # Journal effects assume the balance triggers apply each insert
+    create_triggers_if_missing()
     # Resolve seed path
     if seed_path is None:
         seed_path = str(BACKEND_ROOT / "seed" / "seed.json")
@@ -31,8 +34,11 @@ def load_seed(seed_path: str | None = None) -> None:
         # fund balances
         for row in data.get("fund_balances", []):
             fb = db.get(FundBalance, row["fund"]) or FundBalance(fund=row["fund"], balance_paise=0)
+            old = fb.balance_paise
             fb.balance_paise = int(row["balance_paise"])  # authoritative
             db.add(fb)
+            db.flush()
+            record_fund_set(db, row["fund"], old, fb.balance_paise)
         # people
         for row in data.get("people", []):
             if not db.get(Person, row["id"]):
@@ -47,7 +53,7 @@ def load_seed(seed_path: str | None = None) -> None:
             if not db.get(Transaction, row["id"]):
                 d = row["date"]
                 d_py = date.fromisoformat(d) if isinstance(d, str) else d
-                db.add(Transaction(
+                t = Transaction(
                     id=row["id"],
                     txn_type=row["txn_type"],
                     amount_paise=int(row["amount_paise"]),
@@ -59,7 +65,10 @@ def load_seed(seed_path: str | None = None) -> None:
                     category_id=row.get("category_id"),
                     party=row.get("party"),
                     notes=row.get("notes"),
-                ))
+                )
+                db.add(t)
+                db.flush()
+                record_insert(db, t)
         db.commit()
 
 